@@ -1,86 +1,254 @@
 import streamlit as st
 import pulp
-import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, time
 
-def logical_optimization(total_hours, subjects, names, priorities, min_times):
-    """Two-stage linear optimization without energy levels."""
-    M = float(total_hours)
-
-    # Stage 1: Max subjects possible
-    prob1 = pulp.LpProblem("Stage1_Max_Subjects", pulp.LpMaximize)
-    x1 = {i: pulp.LpVariable(f"x1_{i}", lowBound=0) for i in range(subjects)}
-    y1 = {i: pulp.LpVariable(f"y1_{i}", cat="Binary") for i in range(subjects)}
-    t1 = pulp.LpVariable("t1", lowBound=0)
-
-    prob1 += pulp.lpSum(y1[i] for i in range(subjects))
-    prob1 += pulp.lpSum(x1[i] for i in range(subjects)) <= total_hours
-
+# Up to this many subjects Smart Auto is solved in closed form instead of with a MILP solver
+CLOSED_FORM_MAX_SUBJECTS = 12
+
+
+@st.cache_resource(show_spinner=False)
+def _milp_solver():
+    """In-process HiGHS when PuLP can reach highspy, otherwise a CBC subprocess.
+
+    Held as a resource because the page script re-runs on every interaction; the
+    solver is configured once per process, on the first solve that needs it.
+    Only CBC reads the greedy warm start: PuLP's HiGHS interface ignores initial
+    values and rejects a warmStart option.
+    """
+    highs = getattr(pulp, "HiGHS", None)
+    if highs is not None:
+        solver = highs(msg=False)
+        if solver.available():
+            return solver
+    return pulp.PULP_CBC_CMD(msg=0, warmStart=True)
+
+
+@st.cache_resource(show_spinner=False)
+def _quarter_hour_labels():
+    """Clock labels for every quarter hour of the day, indexed by minute_of_day // 15.
+
+    Held as a resource so the table is formatted once per process, the first time a
+    schedule is built, rather than on every rerun of the page script.
+    """
+    return np.array([
+        (datetime(2000, 1, 1) + timedelta(minutes=15 * q)).strftime('%I:%M %p') for q in range(96)
+    ])
+
+
+def _closed_form_logical(total_hours, priorities, min_times):
+    """Exact Smart Auto allocation without a solver.
+
+    Selected subjects get x_i = p_i * t with t = total_hours / sum(p), so a set fits
+    iff max(m_i / p_i) * sum(p_i) <= total_hours. For each candidate bottleneck j,
+    the largest fitting set adds the smallest priorities among subjects whose ratio
+    does not exceed j's.
+    """
+    subjects = len(priorities)
+    ratios = [min_times[i] / priorities[i] for i in range(subjects)]
+    by_priority = sorted(range(subjects), key=lambda i: priorities[i])
+
+    best = []
+    for j in range(subjects):
+        if min_times[j] > total_hours:
+            continue
+        chosen, used = [j], priorities[j]
+        for i in by_priority:
+            if i == j or ratios[i] > ratios[j]:
+                continue
+            if ratios[j] * (used + priorities[i]) > total_hours + 1e-9:
+                break
+            chosen.append(i)
+            used += priorities[i]
+        if len(chosen) > len(best):
+            best, best_used = chosen, used
+
+    if not best:
+        return []
+    t = total_hours / best_used
+    return [(i, round(priorities[i] * t * 2) / 2) for i in sorted(best)]
+
+
+def _greedy_start(total_hours, priorities, min_times):
+    """Feasible (not always maximal) Smart Auto selection used to seed the MILP.
+
+    Subjects are added in ascending min_time / priority order, so each new subject
+    becomes the bottleneck; the first one that no longer fits ends the prefix.
+    """
+    order = sorted(range(len(priorities)), key=lambda i: min_times[i] / priorities[i])
+    chosen, used = [], 0
+    for i in order:
+        if min_times[i] / priorities[i] * (used + priorities[i]) > total_hours + 1e-9:
+            break
+        chosen.append(i)
+        used += priorities[i]
+    return chosen, used
+
+
+def _greedy_is_maximal(total_hours, priorities, min_times, count):
+    """True when no count + 1 subjects can fit together.
+
+    Any such set has a bottleneck ratio of at least the (count + 1)-th smallest
+    ratio and a priority sum of at least the count + 1 smallest priorities.
+    """
+    if count == len(priorities):
+        return True
+    ratio = sorted(min_times[i] / priorities[i] for i in range(len(priorities)))[count]
+    return ratio * sum(sorted(priorities)[:count + 1]) > total_hours + 1e-9
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _solve_logical(total_hours, priorities, min_times):
+    """Lexicographic linear optimization without energy levels.
+
+    Takes hashable tuples so Streamlit can reuse the solution across reruns.
+    Returns (subject index, hours) pairs, or an empty list if no subject fits.
+    """
+    subjects = len(priorities)
+    if subjects <= CLOSED_FORM_MAX_SUBJECTS:
+        return _closed_form_logical(total_hours, priorities, min_times)
+
+    chosen, used = _greedy_start(total_hours, priorities, min_times)
+    if _greedy_is_maximal(total_hours, priorities, min_times, len(chosen)):
+        if not chosen:
+            return []
+        t = total_hours / used
+        return [(i, round(priorities[i] * t * 2) / 2) for i in sorted(chosen)]
+
+    # Selected subjects share t = total_hours / sum(p), so t never exceeds this
+    t_max = total_hours / min(priorities)
+
+    # One extra subject outweighs every hour of utilization (sum(x) <= total_hours),
+    # so a single solve maximizes coverage first and allocated time second
+    prob = pulp.LpProblem("Max_Subjects_Then_Time", pulp.LpMaximize)
+    x = {i: pulp.LpVariable(f"x_{i}", lowBound=0) for i in range(subjects)}
+    y = {i: pulp.LpVariable(f"y_{i}", cat="Binary") for i in range(subjects)}
+    t = pulp.LpVariable("t", lowBound=0, upBound=t_max)
+
+    hours_terms = [(x[i], 1) for i in range(subjects)]
+    prob += pulp.LpAffineExpression([(y[i], total_hours + 1) for i in range(subjects)] + hours_terms)
+    prob += pulp.LpAffineExpression(hours_terms) <= total_hours
+
+    # x = p*t for selected subjects. x <= p*t holds for every subject (x is 0 when
+    # unselected), so only p*t - x needs relaxing, by exactly p*t_max.
+    # Coefficients are written out directly rather than letting PuLP expand
+    # expressions such as p*t - x <= M*(1 - y) through temporary objects
     for i in range(subjects):
-        prob1 += x1[i] >= min_times[i] * y1[i]
-        prob1 += x1[i] <= total_hours * y1[i]
         p = priorities[i]
-        prob1 += x1[i] - p * t1 <= M * (1 - y1[i])
-        prob1 += -(x1[i] - p * t1) <= M * (1 - y1[i])
+        M = p * t_max
+        prob += pulp.LpAffineExpression([(x[i], 1), (y[i], -min_times[i])]) >= 0
+        prob += pulp.LpAffineExpression([(x[i], 1), (y[i], -total_hours)]) <= 0
+        prob += pulp.LpAffineExpression([(x[i], 1), (t, -p)]) <= 0
+        prob += pulp.LpAffineExpression([(x[i], -1), (t, p), (y[i], M)]) <= M
+
+    # Hand CBC a feasible incumbent so branch-and-bound starts from a good bound (HiGHS
+    # ignores it); with nothing chosen the all-zero start is still feasible
+    start_t = total_hours / used if chosen else 0
+    chosen = set(chosen)
+    t.setInitialValue(start_t)
+    for i in range(subjects):
+        active = i in chosen
+        y[i].setInitialValue(1 if active else 0)
+        x[i].setInitialValue(priorities[i] * start_t if active else 0)
 
-    prob1.solve(pulp.PULP_CBC_CMD(msg=0))
-    k = int(round(sum(pulp.value(y1[i]) for i in range(subjects))))
+    prob.solve(_milp_solver())
 
-    if k == 0:
+    # Read the solution back in one pass instead of one pulp.value() call per variable
+    active = np.fromiter((y[i].varValue or 0.0 for i in range(subjects)), dtype=np.float64, count=subjects) > 0.5
+    hours = np.fromiter((x[i].varValue or 0.0 for i in range(subjects)), dtype=np.float64, count=subjects)
+    rounded = np.round(hours * 2) / 2
+    return [(int(i), float(rounded[i])) for i in np.flatnonzero(active)]
+
+
+def logical_optimization(total_hours, subjects, names, priorities, min_times):
+    """Cover as many subjects as possible, then use as many hours as possible."""
+    allocation = _solve_logical(float(total_hours), tuple(priorities), tuple(min_times))
+    if not allocation:
         st.error("Not enough total hours to satisfy the minimum time constraints.")
         return []
+    return [(names[i] or f"Subject {i+1}", hours, priorities[i]) for i, hours in allocation]
 
-    # Stage 2: Allocate hours to maximize utilization
-    prob2 = pulp.LpProblem("Stage2_Max_Time", pulp.LpMaximize)
-    x2 = {i: pulp.LpVariable(f"x2_{i}", lowBound=0) for i in range(subjects)}
-    y2 = {i: pulp.LpVariable(f"y2_{i}", cat="Binary") for i in range(subjects)}
-    t2 = pulp.LpVariable("t2", lowBound=0)
 
-    prob2 += pulp.lpSum(x2[i] for i in range(subjects))
-    prob2 += pulp.lpSum(x2[i] for i in range(subjects)) <= total_hours
-    prob2 += pulp.lpSum(y2[i] for i in range(subjects)) == k
+def _softmax_numpy(logits, min_times, total_hours):
+    """Softmax-weighted hours on top of each minimum, snapped to half hours.
 
-    for i in range(subjects):
-        prob2 += x2[i] >= min_times[i] * y2[i]
-        prob2 += x2[i] <= total_hours * y2[i]
-        p = priorities[i]
-        prob2 += x2[i] - p * t2 <= M * (1 - y2[i])
-        prob2 += -(x2[i] - p * t2) <= M * (1 - y2[i])
+    Shared by the Entropy and Pareto modes; the max shift keeps exp() from overflowing.
+    """
+    weights = np.exp(logits - logits.max())
+    final_times = min_times + (total_hours - min_times.sum()) * weights / weights.sum()
+    return np.round(final_times * 2) / 2
 
-    prob2.solve(pulp.PULP_CBC_CMD(msg=0))
 
-    results = []
-    for i in range(subjects):
-        if pulp.value(y2[i]) > 0.5:
-            raw_time = pulp.value(x2[i])
-            rounded_time = round(raw_time * 2) / 2
-            results.append((names[i] or f"Subject {i+1}", rounded_time, priorities[i]))
-    return results
+def _softmax_loop(logits, min_times, total_hours):
+    """Loop form of _softmax_numpy for Numba to compile into a single pass."""
+    n = logits.size
+    remaining = total_hours - min_times.sum()
+    top = logits.max()
+
+    weights = np.empty(n)
+    total_weight = 0.0
+    for i in range(n):
+        weights[i] = np.exp(logits[i] - top)
+        total_weight += weights[i]
+
+    final_times = np.empty(n)
+    for i in range(n):
+        final_times[i] = round((min_times[i] + remaining * weights[i] / total_weight) * 2) / 2
+    return final_times
+
+
+@st.cache_resource(show_spinner=False)
+def _softmax_kernel():
+    """Numba-compiled softmax allocation when numba is installed, else the NumPy one.
+
+    Held as a resource because the page script re-runs on every interaction; the
+    kernel is decorated once per process and compiles on its first call.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _softmax_numpy
+    return njit(cache=True, fastmath=True)(_softmax_loop)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _solve_entropy(total_hours, priorities, min_times):
+    """Cached entropy allocation; returns hours per subject as a list."""
+    return _softmax_kernel()(
+        np.asarray(priorities, dtype=np.float64),
+        np.asarray(min_times, dtype=np.float64),
+        total_hours,
+    ).tolist()
 
 
 def entropy_distribution(total_hours, names, priorities, min_times):
     """Entropy-based (Softmax) direct allocation."""
-    n = len(names)
     min_total = sum(min_times)
 
     if min_total > total_hours:
         st.error("Total hours too small for minimum time requirements.")
         return []
 
-    remaining = total_hours - min_total
-    weights = np.exp(priorities)
-    softmax_weights = weights / np.sum(weights)
+    final_times = _solve_entropy(float(total_hours), tuple(priorities), tuple(min_times))
+    return list(zip(names, final_times, priorities))
 
-    extra_time = remaining * softmax_weights
-    final_times = np.array(min_times) + extra_time
-    final_times = np.round(final_times * 2) / 2
 
-    results = []
-    for i in range(n):
-        results.append((names[i], final_times[i], priorities[i]))
-    return results
+@st.cache_data(show_spinner=False, max_entries=32)
+def _solve_pareto(total_hours, priorities, min_times, difficulty_levels):
+    """Cached Pareto allocation; returns hours per subject as a list."""
+    # Normalize priorities and difficulties
+    norm_priorities = np.asarray(priorities, dtype=np.float64) / 5.0
+    norm_difficulties = np.asarray(difficulty_levels, dtype=np.float64) / 5.0
+
+    # Combined score: higher priority + higher difficulty gets more time
+    combined_scores = 0.6 * norm_priorities + 0.4 * norm_difficulties
+
+    return _softmax_kernel()(
+        combined_scores * 2,
+        np.asarray(min_times, dtype=np.float64),
+        total_hours,
+    ).tolist()
 
 
 def pareto_optimization(total_hours, subjects, names, priorities, min_times, difficulty_levels):
@@ -89,60 +257,70 @@ def pareto_optimization(total_hours, subjects, names, priorities, min_times, dif
     if min_total > total_hours:
         st.error("Total hours too small for minimum time requirements.")
         return []
-    
-    # Normalize priorities and difficulties
-    norm_priorities = np.array(priorities) / 5.0
-    norm_difficulties = np.array(difficulty_levels) / 5.0
-    
-    # Combined score: higher priority + higher difficulty gets more time
-    combined_scores = 0.6 * norm_priorities + 0.4 * norm_difficulties
-    
-    remaining = total_hours - min_total
-    weights = np.exp(combined_scores * 2)
-    softmax_weights = weights / np.sum(weights)
-    
-    extra_time = remaining * softmax_weights
-    final_times = np.array(min_times) + extra_time
-    final_times = np.round(final_times * 2) / 2
-    
-    results = []
-    for i in range(subjects):
-        results.append((names[i], final_times[i], priorities[i]))
-    return results
+
+    final_times = _solve_pareto(
+        float(total_hours), tuple(priorities), tuple(min_times), tuple(difficulty_levels)
+    )
+    return list(zip(names, final_times, priorities))
 
 
 def schedule_with_breaks(results, start_time, break_interval=1.5, break_duration=0.25):
-    """Generate time-blocked schedule with breaks."""
-    schedule = []
-    current_time = start_time
-    
+    """Generate time-blocked schedule with breaks, one row per block."""
+    durations, subjects, kinds = [], [], []
     for subj, hrs, _ in results:
-        remaining = hrs
-        while remaining > 0:
-            study_block = min(remaining, break_interval)
-            end_time = current_time + timedelta(hours=study_block)
-            schedule.append({
-                'subject': subj,
-                'start': current_time.strftime('%I:%M %p'),
-                'end': end_time.strftime('%I:%M %p'),
-                'duration': study_block,
-                'type': 'study'
-            })
-            current_time = end_time
-            remaining -= study_block
-            
-            if remaining > 0:
-                break_end = current_time + timedelta(hours=break_duration)
-                schedule.append({
-                    'subject': '☕ Break',
-                    'start': current_time.strftime('%I:%M %p'),
-                    'end': break_end.strftime('%I:%M %p'),
-                    'duration': break_duration,
-                    'type': 'break'
-                })
-                current_time = break_end
-    
-    return schedule
+        blocks = int(np.ceil(hrs / break_interval))
+        if blocks <= 0:
+            continue
+        # Study blocks of break_interval hours (the last one takes the remainder),
+        # with a break between consecutive blocks of the same subject
+        row = np.full(2 * blocks - 1, float(break_duration))
+        row[::2] = break_interval
+        row[-1] = hrs - break_interval * (blocks - 1)
+        durations.append(row)
+        subjects += [subj, '☕ Break'] * (blocks - 1) + [subj]
+        kinds += ['study', 'break'] * (blocks - 1) + ['study']
+
+    if not durations:
+        return pd.DataFrame(columns=['subject', 'start', 'end', 'duration', 'type'])
+
+    durations = np.concatenate(durations)
+    # Every block starts where the previous one ends, so label the boundaries once
+    offsets = np.concatenate(([0.0], np.cumsum(durations)))
+    quarters = (start_time.hour * 60 + start_time.minute + offsets * 60) / 15
+    whole = np.round(quarters)
+    if start_time.second == 0 and start_time.microsecond == 0 and np.allclose(quarters, whole):
+        quarter_labels = _quarter_hour_labels()
+        labels = quarter_labels[whole.astype(np.int64) % len(quarter_labels)]
+    else:
+        labels = (pd.Timestamp(start_time) + pd.to_timedelta(offsets, unit='h')).strftime('%I:%M %p')
+
+    return pd.DataFrame({
+        'subject': subjects,
+        'start': labels[:-1],
+        'end': labels[1:],
+        'duration': durations,
+        'type': kinds
+    })
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def study_plan_csv(results):
+    """Encoded CSV export of a study plan, reused while the plan is unchanged."""
+    df = pd.DataFrame(list(results), columns=["Subject", "Hours", "Priority"])
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def subject_table(subjects, previous=None):
+    """Default per-subject inputs, keeping any rows already filled in."""
+    table = pd.DataFrame({
+        'Name': [f"Subject {i+1}" for i in range(subjects)],
+        'Priority': 3,
+        'Min Hours': 0.5,
+        'Difficulty': 3
+    })
+    if previous is not None:
+        table = pd.concat([previous.head(subjects), table.iloc[len(previous):]], ignore_index=True)
+    return table
 
 
 def run():
@@ -161,25 +339,7 @@ def run():
     total_hours = st.number_input("Enter the number of free hours you have today:", min_value=0.5, step=0.5, value=6.0)
     subjects = st.number_input("Enter the number of subjects you wish to cover:", min_value=1, step=1, value=3)
 
-    names, priorities, min_times, difficulty_levels = [], [], [], []
-    
-    st.subheader("Enter details for each subject:")
-    for i in range(subjects):
-        with st.expander(f"📚 Subject {i+1}", expanded=(i==0)):
-            col1, col2 = st.columns(2)
-            with col1:
-                name = st.text_input(f"Subject Name:", key=f"name_{i}", value=f"Subject {i+1}")
-                priority = st.select_slider("Priority:", options=[1,2,3,4,5], value=3, key=f"priority_{i}")
-                min_time = st.number_input("Minimum time (hrs):", min_value=0.0, step=0.5, key=f"min_{i}", value=0.5)
-            with col2:
-                difficulty = st.select_slider("Difficulty:", options=[1,2,3,4,5], value=3, key=f"diff_{i}")
-                difficulty_levels.append(difficulty)
-            
-            names.append(name or f"Subject {i+1}")
-            priorities.append(priority)
-            min_times.append(min_time)
-
-    # Mode selection
+    # Mode is chosen first so the table only shows the columns it needs
     st.subheader("🎯 Select Optimization Mode:")
     mode = st.radio(
         "",
@@ -195,8 +355,38 @@ def run():
         ]
     )
 
-    # Generate button
-    if st.button("Generate Optimal Timetable", type="primary"):
+    # One editable table instead of four widgets per subject on every rerun
+    st.subheader("Enter details for each subject:")
+    if 'subject_table' not in st.session_state:
+        st.session_state.subject_table = subject_table(subjects)
+    elif len(st.session_state.subject_table) != subjects:
+        st.session_state.subject_table = subject_table(subjects, st.session_state.subject_table)
+
+    is_pareto = mode == "Pareto (Multi-Objective Balance)"
+    # Edits are batched in a form, so typing in the table does not rerun the page
+    with st.form("subject_inputs"):
+        edited_df = st.data_editor(
+            st.session_state.subject_table,
+            num_rows="fixed",
+            column_config={
+                'Name': st.column_config.TextColumn("Subject Name"),
+                'Priority': st.column_config.NumberColumn("Priority", min_value=1, max_value=5, step=1, required=True),
+                'Min Hours': st.column_config.NumberColumn("Minimum time (hrs)", min_value=0.0, step=0.5, required=True),
+                'Difficulty': st.column_config.NumberColumn("Difficulty", min_value=1, max_value=5, step=1, required=True)
+            },
+            column_order=['Name', 'Priority', 'Min Hours'] + (['Difficulty'] if is_pareto else []),
+            hide_index=True,
+            key="subject_editor"
+        )
+        submitted = st.form_submit_button("Generate Optimal Timetable", type="primary")
+    st.session_state.subject_table = edited_df
+
+    names = [name or f"Subject {i+1}" for i, name in enumerate(edited_df['Name'].fillna(""))]
+    priorities = edited_df['Priority'].astype(int).tolist()
+    min_times = edited_df['Min Hours'].astype(float).tolist()
+    difficulty_levels = edited_df['Difficulty'].astype(int).tolist() if is_pareto else []
+
+    if submitted:
         try:
             if mode == "Smart Auto (Logical Optimization)":
                 results = logical_optimization(total_hours, subjects, names, priorities, min_times)
@@ -227,47 +417,26 @@ def run():
             for subj, hrs, prio in results:
                 st.write(f"📖 **{subj}:** {hrs} hours | Priority: {'⭐' * prio}")
 
-            col1, col2 = st.columns(2)
-            with col1:
-                labels = [r[0] for r in results]
-                sizes = [r[1] for r in results]
-                colors = plt.cm.Set3(range(len(results)))
-                fig, ax = plt.subplots(figsize=(8, 6))
-                ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90, colors=colors)
-                ax.axis('equal')
-                plt.title('Time Distribution')
-                st.pyplot(fig)
-
-            with col2:
-                fig, ax = plt.subplots(figsize=(8, 6))
-                subjects_names = [r[0] for r in results]
-                hours = [r[1] for r in results]
-                colors_bar = plt.cm.viridis(np.linspace(0, 1, len(results)))
-                ax.barh(subjects_names, hours, color=colors_bar)
-                ax.set_xlabel('Hours')
-                ax.set_title('Hours per Subject')
-                ax.grid(axis='x', alpha=0.3)
-                st.pyplot(fig)
+            df = pd.DataFrame(results, columns=["Subject", "Hours", "Priority"])
+            st.bar_chart(df.set_index("Subject")["Hours"])
 
             if enable_schedule:
                 st.subheader("🕐 Time-Blocked Schedule")
                 schedule_start = datetime.combine(datetime.today(), start_time)
                 schedule = schedule_with_breaks(results, schedule_start, break_interval, break_duration)
                 
-                for item in schedule:
-                    if item['type'] == 'study':
-                        st.info(f"**{item['start']} - {item['end']}**: {item['subject']} ({item['duration']} hrs)")
+                for item in schedule.itertuples(index=False):
+                    if item.type == 'study':
+                        st.info(f"**{item.start} - {item.end}**: {item.subject} ({item.duration} hrs)")
                     else:
-                        st.success(f"**{item['start']} - {item['end']}**: {item['subject']} ({item['duration']} hrs)")
+                        st.success(f"**{item.start} - {item.end}**: {item.subject} ({item.duration} hrs)")
 
-            df = pd.DataFrame(results, columns=["Subject", "Hours", "Priority"])
             st.subheader("📋 Summary Table")
             st.dataframe(df, use_container_width=True)
 
-            csv = df.to_csv(index=False)
             st.download_button(
                 label="📥 Download Study Plan (CSV)",
-                data=csv,
+                data=study_plan_csv(tuple(results)),
                 file_name=f"study_plan_{mode_name.lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -10,15 +9,31 @@ DEFAULT_COURSE_NAME = 'Calculus I'
 DEFAULT_TARGET_GRADE = 90.0
 DEFAULT_COURSE_CREDITS = 3.0
 
+# Columns that start out empty must not fall back to object dtype
+ASSIGNMENT_DTYPES = {'Grade (%)': 'float64', 'Completed': 'bool', 'Study Hours': 'float64'}
+
+# Indexed by (slope >= -1) + (slope > 1)
+TREND_LABELS = ("📉 Declining", "➡️ Stable", "📈 Improving")
+
+# Indexed by (gap > 0) + (gap > 10), where gap = target - average
+GOAL_STATUSES = (
+    ("🟢 On Track", "Your average ({avg:.1f}%) meets or exceeds target ({target:.1f}%)"),
+    ("🟡 Close to Target", "You're {gap:.1f}% away from target. Keep pushing!"),
+    ("🔴 Need Improvement", "You're {gap:.1f}% below target. Focus on upcoming assignments!")
+)
+
+# Indexed by met + 2 * pending + 2 * (pending and required > 100), where met means
+# the earned grade already reaches the target and pending means weight remains
+TARGET_STATUSES = (
+    ("error", "❌ Final grade ({final:.1f}%) below target"),
+    ("success", "✅ Final grade ({final:.1f}%) meets target!"),
+    ("warning", "📌 Need {required:.1f}% average on remaining {remaining:.0f}% of work"),
+    ("success", "✅ Target secured! You can score 0% on remaining work and still hit your target"),
+    ("error", "❌ Need {required:.1f}% average on remaining work - Target unachievable")
+)
+
 def initialize_data():
     """Initialize session state with default data"""
-    if 'gpa_scale' not in st.session_state:
-        st.session_state.gpa_scale = pd.DataFrame({
-            'Letter Grade': ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'F'],
-            'Min Grade (%)': [97.0, 93.0, 90.0, 87.0, 83.0, 80.0, 77.0, 73.0, 70.0, 67.0, 60.0, 0.0],
-            'GPA Value': [4.0, 4.0, 3.7, 3.3, 3.0, 2.7, 2.3, 2.0, 1.7, 1.3, 1.0, 0.0]
-        })
-
     if 'gpa_data' not in st.session_state:
         st.session_state.gpa_data = {}
 
@@ -33,7 +48,7 @@ def initialize_data():
                 'Grade (%)': [85.0, 92.0, 88.0, None, None],
                 'Completed': [True, True, True, False, False],
                 'Study Hours': [10, 3, 15, None, None]
-            })
+            }).astype(ASSIGNMENT_DTYPES)
         }
 
     if 'current_course' not in st.session_state:
@@ -43,31 +58,24 @@ def initialize_data():
 
 # ML Feature 1: Grade Trend Prediction
 def predict_final_grade_ml(course_data):
-    """Use Linear Regression to predict final grade based on performance trend"""
-    df = course_data['assignments'].copy()
-    completed = df[df['Completed'] == True].copy()
+    """Use a least-squares linear fit to predict final grade based on performance trend"""
+    _, grades, completed = course_arrays(course_data)
+    y = grades[completed]
+    n = y.size
     
-    if len(completed) < 2:
+    if n < 2:
         return None, None, "Need more data"
     
-    completed['sequence'] = range(len(completed))
-    X = completed[['sequence']].values
-    y = completed['Grade (%)'].values
-    
-    model = LinearRegression()
-    model.fit(X, y)
+    # Closed-form simple linear regression of grade on assignment sequence
+    x = np.arange(n, dtype=np.float64)
+    sx, sy = x.sum(), y.sum()
+    slope = (n * (x @ y) - sx * sy) / (n * (x @ x) - sx * sx)
+    intercept = (sy - slope * sx) / n
     
-    future_sequence = len(df) - 1
-    predicted_grade = model.predict([[future_sequence]])[0]
+    future_sequence = completed.size - 1
+    predicted_grade = intercept + slope * future_sequence
     
-    slope = model.coef_[0]
-    
-    if slope > 1:
-        trend = "📈 Improving"
-    elif slope < -1:
-        trend = "📉 Declining"
-    else:
-        trend = "➡️ Stable"
+    trend = TREND_LABELS[int(slope >= -1) + int(slope > 1)]
     
     return max(0, min(100, predicted_grade)), slope, trend
 
@@ -77,51 +85,51 @@ def assess_goal_achievement(course_data, target_grade):
     Simple assessment: Will you likely meet your target?
     Green = On track, Yellow = At risk, Red = Unlikely without major improvement
     """
-    df = course_data['assignments'].copy()
-    completed = df[df['Completed'] == True]
+    _, grades, completed = course_arrays(course_data)
     
-    if len(completed) == 0:
+    if not completed.any():
         return "⚪ No Data Yet", "Start completing assignments to see your progress"
     
     # Calculate current average
-    avg_grade = completed['Grade (%)'].mean()
+    avg_grade = np.nanmean(grades[completed])
     
     # Simple logic: compare average to target
     gap = target_grade - avg_grade
     
-    if gap <= 0:
-        return "🟢 On Track", f"Your average ({avg_grade:.1f}%) meets or exceeds target ({target_grade:.1f}%)"
-    elif gap <= 10:
-        return "🟡 Close to Target", f"You're {gap:.1f}% away from target. Keep pushing!"
-    else:
-        return "🔴 Need Improvement", f"You're {gap:.1f}% below target. Focus on upcoming assignments!"
+    status, message = GOAL_STATUSES[int(gap > 0) + int(gap > 10)]
+    return status, message.format(avg=avg_grade, target=target_grade, gap=gap)
 
 # ML Feature 3: Optimal Study Time Allocation
 def optimize_study_time(course_data, available_hours):
     """Allocate study time optimally across remaining assignments"""
-    df = course_data['assignments'].copy()
-    remaining = df[df['Completed'] == False].copy()
+    assignments = course_data['assignments']
+    weights, _, completed = course_arrays(course_data)
+    remaining = ~completed
     
-    if len(remaining) == 0:
+    if not remaining.any():
         return None
     
-    remaining['priority_score'] = remaining['Weight (%)']
-    total_priority = remaining['priority_score'].sum()
-    remaining['recommended_hours'] = (remaining['priority_score'] / total_priority) * available_hours
-    remaining['recommended_hours'] = remaining['recommended_hours'].round(1)
+    remaining_weights = weights[remaining]
+    recommended_hours = np.round(remaining_weights / np.nansum(remaining_weights) * available_hours, 1)
     
-    return remaining[['Assignment Name', 'Weight (%)', 'recommended_hours']]
+    return pd.DataFrame({
+        'Assignment Name': assignments['Assignment Name'].to_numpy()[remaining],
+        'Weight (%)': assignments['Weight (%)'].to_numpy()[remaining],
+        'recommended_hours': recommended_hours
+    })
 
 # ML Feature 4: Performance Insights
 def generate_ml_insights(course_data, target_grade):
     """Generate insights and recommendations"""
-    df = course_data['assignments'].copy()
-    completed = df[df['Completed'] == True]
+    assignments = course_data['assignments']
+    _, grades, completed = course_arrays(course_data)
+    graded = completed & ~np.isnan(grades)
     
     insights = []
     
-    if len(completed) > 0:
-        avg_grade = completed['Grade (%)'].mean()
+    if graded.any():
+        completed_grades = grades[graded]
+        avg_grade = completed_grades.mean()
         
         if avg_grade >= target_grade:
             insights.append(f"✅ Your average ({avg_grade:.1f}%) exceeds your target ({target_grade:.1f}%)")
@@ -129,70 +137,120 @@ def generate_ml_insights(course_data, target_grade):
             gap = target_grade - avg_grade
             insights.append(f"⚠️ You're {gap:.1f}% below your target on average")
         
-        std = completed['Grade (%)'].std()
+        # Sample standard deviation, as pandas reported it
+        std = completed_grades.std(ddof=1) if completed_grades.size > 1 else 0.0
         if std > 10:
             insights.append("📊 Your grades vary significantly. Try to be more consistent")
         else:
             insights.append("📊 Your performance is consistent - great job!")
         
-        if len(completed) > 1:
-            best_assignment = completed.loc[completed['Grade (%)'].idxmax(), 'Assignment Name']
-            worst_assignment = completed.loc[completed['Grade (%)'].idxmin(), 'Assignment Name']
+        if completed_grades.size > 1:
+            completed_names = assignments['Assignment Name'].to_numpy()[graded]
+            best_assignment = completed_names[completed_grades.argmax()]
+            worst_assignment = completed_names[completed_grades.argmin()]
             insights.append(f"🌟 Best: {best_assignment} | 📚 Study more: {worst_assignment}")
         
-        if 'Study Hours' in completed.columns and completed['Study Hours'].notna().any():
-            completed_with_hours = completed[completed['Study Hours'].notna()]
-            if len(completed_with_hours) > 0:
-                completed_with_hours['efficiency'] = completed_with_hours['Grade (%)'] / completed_with_hours['Study Hours']
-                avg_efficiency = completed_with_hours['efficiency'].mean()
-                insights.append(f"⏱️ Avg efficiency: {avg_efficiency:.1f} points per study hour")
+        hours = assignments['Study Hours'].to_numpy(dtype=np.float64)
+        with_hours = graded & (hours > 0)
+        if with_hours.any():
+            avg_efficiency = (grades[with_hours] / hours[with_hours]).mean()
+            insights.append(f"⏱️ Avg efficiency: {avg_efficiency:.1f} points per study hour")
     
     return insights
 
 # Core Calculations
-def calculate_course_grade(course_data):
-    """Calculate current and projected grades"""
-    df = course_data['assignments'].copy()
-    
-    total_weight = df['Weight (%)'].sum()
+def assignment_arrays(assignments):
+    """Return weights, grades and completion flags as NumPy arrays"""
+    weights = assignments['Weight (%)'].to_numpy(dtype=np.float64)
+    grades = assignments['Grade (%)'].to_numpy(dtype=np.float64)
+    completed = assignments['Completed'].to_numpy(dtype=bool)
+    return weights, grades, completed
+
+def course_arrays(course_data):
+    """Return the course's assignment arrays, rebuilt only when its table is replaced"""
+    assignments = course_data['assignments']
+    cached = course_data.get('arrays')
+    if cached is None or cached[0] is not assignments:
+        cached = (assignments, assignment_arrays(assignments))
+        course_data['arrays'] = cached
+    return cached[1]
+
+def grade_terms(weights, grades, completed):
+    """Current grade, weighted completed grade and completed weight along the last axis"""
+    # One formula for a single course and for the padded all-course sweep, so the
+    # sidebar and the details pane cannot disagree; as with pandas sums, a completed
+    # row without a grade keeps its weight but adds nothing to the weighted total
+    completed_weights = np.where(completed, weights, np.nan)
+    total_completed_weight = np.nansum(completed_weights, axis=-1)
+    weighted_completed_grade = np.nansum(completed_weights * grades, axis=-1) / 100
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        current_grade = np.where(total_completed_weight > 0, weighted_completed_grade / (total_completed_weight / 100), 0.0)
+    return current_grade, weighted_completed_grade, total_completed_weight
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def grade_from_arrays(weights, grades, completed):
+    """Calculate current and projected grades, memoized so unchanged courses are not recomputed"""
+    total_weight = np.nansum(weights)
     if total_weight == 0:
         return 0.0, 0.0, 0.0, 0.0
     
-    df['Normalized Weight'] = df['Weight (%)'] / 100
-    df['Weighted Score'] = np.where(df['Completed'], df['Normalized Weight'] * df['Grade (%)'], 0.0)
-    
-    weighted_completed_grade = df['Weighted Score'].sum()
-    total_completed_weight = df[df['Completed'] == True]['Weight (%)'].sum()
-    
-    if total_completed_weight > 0:
-        current_grade = (weighted_completed_grade / (total_completed_weight / 100))
-    else:
-        current_grade = 0.0
+    current_grade, weighted_completed_grade, total_completed_weight = map(float, grade_terms(weights, grades, completed))
     
     projected_final_grade = weighted_completed_grade
     
     return current_grade, weighted_completed_grade, total_completed_weight, projected_final_grade
 
-def optimize_required_score(course_data, target_grade):
+@st.cache_data(max_entries=64, show_spinner=False)
+def current_grades(arrays):
+    """Current grade of every course in one vectorized pass over padded arrays"""
+    width = max((weights.size for weights, _, _ in arrays), default=0)
+    
+    # Pad every course to the longest one; padding is NaN weight, never completed
+    weights = np.full((len(arrays), width), np.nan)
+    grades = np.full((len(arrays), width), np.nan)
+    completed = np.zeros((len(arrays), width), dtype=bool)
+    for row, (w, g, c) in enumerate(arrays):
+        weights[row, :w.size] = w
+        grades[row, :g.size] = g
+        completed[row, :c.size] = c
+    
+    current_grade, _, _ = grade_terms(weights, grades, completed)
+    return current_grade
+
+def required_score_from_arrays(weights, grades, completed, target_grade):
     """Calculate required score on remaining work"""
-    df = course_data['assignments'].copy()
-    
-    df['Normalized Weight'] = df['Weight (%)'] / 100
-    df['Weighted Completed Grade'] = np.where(df['Completed'], df['Normalized Weight'] * df['Grade (%)'], 0.0)
-    weighted_completed_grade = df['Weighted Completed Grade'].sum()
+    # Same weighted total the grade calculation produces (and has usually cached)
+    _, weighted_completed_grade, _, _ = grade_from_arrays(weights, grades, completed)
     
-    remaining_weight_percent = df[df['Completed'] == False]['Weight (%)'].sum()
+    remaining_weight_percent = np.nansum(weights[~completed])
     remaining_weight_normalized = remaining_weight_percent / 100
 
     if remaining_weight_normalized == 0:
-        _, _, _, final_grade = calculate_course_grade(course_data)
-        required_score = final_grade
+        # Nothing left to score: the final grade is what has been earned
+        required_score = weighted_completed_grade
     else:
         required_weighted_remaining = target_grade - weighted_completed_grade
         required_score = required_weighted_remaining / remaining_weight_normalized
     
     return max(0.0, required_score), remaining_weight_percent, weighted_completed_grade
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def optimization_summary(weights, grades, completed, target_grade):
+    """Return the grade metric, remaining weight and status message for the analysis section"""
+    current_grade, _, total_completed_weight, projected_final = grade_from_arrays(weights, grades, completed)
+    required_score, remaining_weight, _ = required_score_from_arrays(weights, grades, completed, target_grade)
+    
+    grade_display = current_grade if total_completed_weight < 100 else projected_final
+    grade_label = "Current Grade" if total_completed_weight < 100 else "Final Grade"
+    
+    pending = remaining_weight > 0
+    met = projected_final >= target_grade
+    level, message = TARGET_STATUSES[int(met) + 2 * int(pending) + 2 * int(pending and required_score > 100)]
+    message = message.format(required=required_score, remaining=remaining_weight, final=projected_final)
+    
+    return grade_label, grade_display, remaining_weight, level, message
+
 # UI Components
 def render_ml_dashboard(course_data, target_grade):
     """Render ML-powered analytics dashboard"""
@@ -214,18 +272,18 @@ def render_ml_dashboard(course_data, target_grade):
         st.caption(goal_message)
     
     with col3:
-        completed_pct = (course_data['assignments']['Completed'].sum() / len(course_data['assignments'])) * 100
-        st.metric("✅ Progress", f"{completed_pct:.0f}%", f"{course_data['assignments']['Completed'].sum()}/{len(course_data['assignments'])} done")
+        _, _, completed = course_arrays(course_data)
+        done, total = int(completed.sum()), completed.size
+        completed_pct = (done / total) * 100 if total else 0.0
+        st.metric("✅ Progress", f"{completed_pct:.0f}%", f"{done}/{total} done")
     
     st.markdown("#### 💡 AI Insights")
     insights = generate_ml_insights(course_data, target_grade)
-    for insight in insights:
-        st.info(insight)
+    if insights:
+        st.info("\n\n".join(insights))
 
-def render_study_optimizer():
+def render_study_optimizer(course_data):
     """Render study time optimization tool"""
-    course_data = st.session_state.gpa_data[st.session_state.current_course]
-    
     st.subheader("⏰ Smart Study Time Allocator")
     st.markdown("AI will distribute your study hours optimally based on assignment weights!")
     
@@ -245,35 +303,43 @@ def render_study_optimizer():
         else:
             st.info("All assignments completed! No study time allocation needed.")
 
+@st.cache_resource(max_entries=64, show_spinner=False)
+def performance_figure(names, grades, target):
+    """Build the grade trend figure, reused while its inputs are unchanged"""
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=list(names),
+        y=list(grades),
+        mode='lines+markers',
+        name='Your Grades',
+        line=dict(color='#1f77b4', width=3),
+        marker=dict(size=10)
+    ))
+    
+    fig.add_hline(y=target, line_dash="dash", line_color="red", 
+                 annotation_text=f"Target: {target}%")
+    
+    fig.update_layout(
+        title="Grade Performance Trend",
+        xaxis_title="Assignment",
+        yaxis_title="Grade (%)",
+        yaxis_range=[0, 100],
+        hovermode='x unified'
+    )
+    
+    return fig
+
 def render_performance_chart(course_data):
     """Render performance visualization"""
-    df = course_data['assignments'].copy()
-    completed = df[df['Completed'] == True]
+    _, grades, completed = course_arrays(course_data)
     
-    if len(completed) > 0:
-        fig = go.Figure()
-        
-        fig.add_trace(go.Scatter(
-            x=completed['Assignment Name'],
-            y=completed['Grade (%)'],
-            mode='lines+markers',
-            name='Your Grades',
-            line=dict(color='#1f77b4', width=3),
-            marker=dict(size=10)
-        ))
-        
-        target = course_data['Target Course Grade (%)']
-        fig.add_hline(y=target, line_dash="dash", line_color="red", 
-                     annotation_text=f"Target: {target}%")
-        
-        fig.update_layout(
-            title="Grade Performance Trend",
-            xaxis_title="Assignment",
-            yaxis_title="Grade (%)",
-            yaxis_range=[0, 100],
-            hovermode='x unified'
+    if completed.any():
+        fig = performance_figure(
+            tuple(course_data['assignments']['Assignment Name'].to_numpy()[completed]),
+            tuple(grades[completed].tolist()),
+            course_data['Target Course Grade (%)']
         )
-        
         st.plotly_chart(fig, use_container_width=True)
 
 def render_subject_details():
@@ -304,25 +370,24 @@ def render_subject_details():
             key=f'target_{course_name}'
         )
     
+    target_grade = course_data['Target Course Grade (%)']
+    
     st.divider()
     
     # ML Dashboard
-    render_ml_dashboard(course_data, course_data['Target Course Grade (%)'])
+    render_ml_dashboard(course_data, target_grade)
     
     st.divider()
     
-    # Grade calculation
-    current_grade, weighted_completed, total_completed_weight, projected_final = calculate_course_grade(course_data)
-    target_grade = course_data['Target Course Grade (%)']
-    required_score, remaining_weight, _ = optimize_required_score(course_data, target_grade)
+    # Grade calculation, memoized on the course arrays and target
+    grade_label, grade_display, remaining_weight, level, message = optimization_summary(
+        *course_arrays(course_data), target_grade
+    )
     
     st.subheader("🎯 Grade Optimization Analysis")
     
     col1, col2, col3 = st.columns(3)
     
-    grade_display = current_grade if total_completed_weight < 100 else projected_final
-    grade_label = "Current Grade" if total_completed_weight < 100 else "Final Grade"
-    
     with col1:
         st.metric(grade_label, f"{grade_display:.1f}%")
     with col2:
@@ -330,18 +395,7 @@ def render_subject_details():
     with col3:
         st.metric("Remaining Weight", f"{remaining_weight:.0f}%")
     
-    if remaining_weight > 0:
-        if required_score > 100:
-            st.error(f"❌ Need {required_score:.1f}% average on remaining work - Target unachievable")
-        elif weighted_completed >= target_grade:
-            st.success(f"✅ Target secured! You can score 0% on remaining work and still hit your target")
-        else:
-            st.warning(f"📌 Need {required_score:.1f}% average on remaining {remaining_weight:.0f}% of work")
-    else:
-        if projected_final >= target_grade:
-            st.success(f"✅ Final grade ({projected_final:.1f}%) meets target!")
-        else:
-            st.error(f"❌ Final grade ({projected_final:.1f}%) below target")
+    getattr(st, level)(message)
     
     st.divider()
     
@@ -351,15 +405,17 @@ def render_subject_details():
     st.divider()
     
     # Study optimizer
-    render_study_optimizer()
+    render_study_optimizer(course_data)
     
     st.divider()
     
     # Assignment editor
     st.subheader("📝 Assignment Manager")
     
+    assignments = course_data['assignments']
+    editor_key = f"editor_{course_name}"
     edited_df = st.data_editor(
-        course_data['assignments'],
+        assignments,
         num_rows="dynamic",
         column_config={
             'Type': st.column_config.TextColumn("Type"),
@@ -370,15 +426,25 @@ def render_subject_details():
             'Study Hours': st.column_config.NumberColumn("Study Hours", min_value=0.0)
         },
         hide_index=True,
-        key=f"editor_{course_name}"
+        key=editor_key
     )
     
-    # Auto-complete based on grade entry
-    edited_df['Completed'] = edited_df['Grade (%)'].apply(lambda x: True if pd.notna(x) else False)
-    course_data['assignments'] = edited_df
-    
-    if edited_df['Weight (%)'].sum() != 100:
-        st.error(f"⚠️ Total weight is {edited_df['Weight (%)'].sum()}% - should be 100%")
+    # The editor's diff is empty until the user touches the table, so reruns from
+    # other widgets skip the post-processing below
+    changes = st.session_state.get(editor_key) or {}
+    if any(changes.get(kind) for kind in ('edited_rows', 'added_rows', 'deleted_rows')):
+        # Rows added in the editor can drift to object dtype; restore the canonical ones
+        edited_df = edited_df.astype(ASSIGNMENT_DTYPES)
+        # Auto-complete based on grade entry
+        edited_df['Completed'] = edited_df['Grade (%)'].notna()
+        # Keep the stored table (and its cached arrays) unless something was edited
+        if not edited_df.equals(assignments):
+            course_data['assignments'] = edited_df
+    
+    weights, _, _ = course_arrays(course_data)
+    total_weight = np.nansum(weights)
+    if total_weight != 100:
+        st.error(f"⚠️ Total weight is {total_weight:g}% - should be 100%")
     
     st.caption("💡 Tip: You can delete rows by clicking the ❌ icon on the left of each row in the table above")
 
@@ -386,9 +452,12 @@ def render_sidebar():
     """Render sidebar"""
     st.sidebar.header("📊 Your Courses")
     
-    for course_name in list(st.session_state.gpa_data.keys()):
-        grade, _, _, _ = calculate_course_grade(st.session_state.gpa_data[course_name])
-        
+    course_names = list(st.session_state.gpa_data.keys())
+    # One cache entry for the whole course list: any main-panel interaction that
+    # leaves every course's arrays unchanged skips the grade sweep entirely
+    grades = current_grades([course_arrays(st.session_state.gpa_data[name]) for name in course_names])
+    
+    for course_name, grade in zip(course_names, grades):
         col1, col2 = st.sidebar.columns([4, 1])
         
         with col1:
@@ -441,7 +510,7 @@ def render_add_course():
                         'Grade (%)': [None],
                         'Completed': [False],
                         'Study Hours': [None]
-                    })
+                    }).astype(ASSIGNMENT_DTYPES)
                 }
                 st.session_state.current_course = name
                 st.session_state.manage_mode = 'details'
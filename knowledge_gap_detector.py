@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -7,6 +8,21 @@ from datetime import datetime
 # Knowledge Gap Detector (Enhanced with Difficulty Weighting + Smart Trend Detection)
 # =====================================================
 
+RESULTS_CSV = "quiz_results.csv"
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_quiz_results(path, mtime):
+    """Parse the results CSV once per file version; mtime keys the cache so new attempts are picked up."""
+    return pd.read_csv(path)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_user_index(path, mtime):
+    """Map each user_id to its row positions so lookups skip scanning the whole column."""
+    return load_quiz_results(path, mtime).groupby("user_id").indices
+
+
 def run():
     st.set_page_config(page_title="Knowledge Gap Detector", layout="wide")
     st.title("🧩 Knowledge Gap & Performance Predictor")
@@ -15,7 +31,8 @@ def run():
 
     # Load results file
     try:
-        df = pd.read_csv("quiz_results.csv")
+        mtime = os.path.getmtime(RESULTS_CSV)
+        df = load_quiz_results(RESULTS_CSV, mtime)
     except FileNotFoundError:
         st.error("⚠ No quiz_results.csv found. Please take some quizzes first.")
         return
@@ -37,7 +54,8 @@ def run():
         st.error("User ID must be numeric.")
         return
 
-    user_df = df[df["user_id"] == user_id]
+    rows = load_user_index(RESULTS_CSV, mtime).get(user_id)
+    user_df = df.iloc[rows] if rows is not None else df.iloc[:0]
 
     if user_df.empty:
         st.warning("No records found for this user.")
@@ -48,6 +66,9 @@ def run():
     # Difficulty weighting
     difficulty_weights = {"Easy": 0.8, "Intermediate": 1.0, "Hard": 1.2}
 
+    # Difficulty levels (numeric scale)
+    diff_levels = {"Easy": 1, "Intermediate": 2, "Hard": 3}
+
     all_predictions = []
     score_trends = []
     subject_slopes = {}
@@ -58,10 +79,7 @@ def run():
             continue
 
         # Apply difficulty-based weighting
-        sub_df["weighted_score"] = sub_df.apply(
-            lambda row: row["score"] * difficulty_weights.get(row["difficulty"], 1.0),
-            axis=1
-        )
+        sub_df["weighted_score"] = sub_df["score"] * sub_df["difficulty"].map(difficulty_weights).fillna(1.0)
 
         scores = sub_df["weighted_score"].tolist()
         raw_scores = sub_df["score"].tolist()
@@ -122,11 +140,8 @@ def run():
         # Ensure the data is sorted chronologically (oldest → newest)
         sub_df = sub_df.sort_values(by="timestamp")
 
-        # Difficulty levels (numeric scale)
-        diff_levels = {"Easy": 1, "Intermediate": 2, "Hard": 3}
-
         # Compute average difficulty value
-        avg_diff_val = np.mean([diff_levels.get(d, 2) for d in sub_df["difficulty"]])
+        avg_diff_val = sub_df["difficulty"].map(diff_levels).fillna(2).mean()
 
         # Get last attempt difficulty based on most recent timestamp
         last_diff = sub_df.iloc[-1]["difficulty"]
@@ -156,15 +171,14 @@ def run():
 
     # ---- Display Results ----
     st.markdown("### 🧠 Subject-Wise Analysis")
-    for subject, raw_scores, predicted_score, trend, reason in score_trends:
-        score_path = " → ".join(map(str, raw_scores))
-        st.markdown(f"""
+    # One markdown element for all subjects instead of one per subject
+    st.markdown("".join(f"""
         **📘 {subject}**
-        - Past Scores: {score_path}
+        - Past Scores: {' → '.join(map(str, raw_scores))}
         - Predicted Next Score: **{int(predicted_score)}/5**
         - Trend: **{trend}**
         - Why: {reason}
-        """)
+        """ for subject, raw_scores, predicted_score, trend, reason in score_trends))
 
     st.markdown("---")
 
@@ -109,6 +109,24 @@ hr {
     color: #444;
     margin-top: 2em;
 }
+
+/* Team Section */
+.center-container {
+    display: flex;
+    justify-content: center;
+    align-items: center;
+    min-height: 55vh;
+    gap: 40px;
+}
+.divider {
+    border-left: 2px solid #ccc;
+    height: 250px;
+}
+.team-text {
+    text-align: left;
+    line-height: 1.8;
+    font-size: 1.1em;
+}
 </style>
 """, unsafe_allow_html=True)
 
@@ -147,7 +165,6 @@ with col2:
                     <li>NumPy</li>
                     <li>Pulp</li>
                     <li>Scikit-learn</li>
-                    <li>Matplotlib & Seaborn</li>
                     <li>HTML & CSS</li>
                     <li>Plotly</li>
                 </ul>
@@ -185,25 +202,6 @@ def image_to_base64(img_path):
 img_base64 = image_to_base64("DAU.webp")
 
 st.markdown(f"""
-<style>
-.center-container {{
-    display: flex;
-    justify-content: center;
-    align-items: center;
-    min-height: 55vh;
-    gap: 40px;
-}}
-.divider {{
-    border-left: 2px solid #ccc;
-    height: 250px;
-}}
-.team-text {{
-    text-align: left;
-    line-height: 1.8;
-    font-size: 1.1em;
-}}
-</style>
-
 <div class="center-container">
     <img src="data:image/webp;base64,{img_base64}" width="300">
     <div class="divider"></div>
@@ -1,29 +1,55 @@
 import streamlit as st
+import pandas as pd
 import csv
 import random
 import os
+import pickle
 from datetime import datetime, timedelta
 
 QUESTIONS_PER_QUIZ = 5
 DEFAULT_DATASET = "quiz_data.csv"
 RESULTS_CSV = "quiz_results.csv"
+RESULTS_HEADER = (
+    "timestamp", "user_id", "subject", "difficulty",
+    "score", "total", "dataset", "attempt_no", "time_spent(mins)"
+)
+# The results log only grows, so scan it with a large read buffer
+CSV_READ_BUFFER = 1 << 20
+# Bump whenever the cached question layout changes so stale pickles get rebuilt
+QUIZ_CACHE_FORMAT = 2
 
 
 def load_quiz_data(filename: str):
+    """Load questions grouped by subject and difficulty, reusing a pickled copy while it is up to date."""
+    cache_path = os.path.splitext(filename)[0] + ".pkl"
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(filename):
+        try:
+            with open(cache_path, "rb") as f:
+                cache_format, quiz_data = pickle.load(f)
+            if cache_format == QUIZ_CACHE_FORMAT:
+                return quiz_data
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            pass  # Corrupt, outdated or unreadable cache, fall back to parsing the CSV
+
+    # Keep every column as text so options and answers compare exactly as written
+    df = pd.read_csv(filename, dtype=str, keep_default_na=False)
+    df["Subject"] = df["Subject"].str.title()
+    df["Difficulty"] = df["Difficulty"].str.title()
+    options = df[["Option1", "Option2", "Option3", "Option4"]].to_numpy().tolist()
+
     quiz_data = {}
-    with open(filename, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            subject = row["Subject"].title()
-            difficulty = row["Difficulty"].title()
-            question = row["Question"]
-            options = [row["Option1"], row["Option2"], row["Option3"], row["Option4"]]
-            answer = row["Answer"]
-            if subject not in quiz_data:
-                quiz_data[subject] = {}
-            if difficulty not in quiz_data[subject]:
-                quiz_data[subject][difficulty] = []
-            quiz_data[subject][difficulty].append((question, options, answer))
+    for subject, difficulty, question, opts, answer in zip(
+        df["Subject"].tolist(), df["Difficulty"].tolist(), df["Question"].tolist(), options, df["Answer"].tolist()
+    ):
+        # Store the answer's option index so grading is an int compare; -1 if it matches no option
+        answer_idx = opts.index(answer) if answer in opts else -1
+        quiz_data.setdefault(subject, {}).setdefault(difficulty, []).append((question, opts, answer_idx, answer))
+
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump((QUIZ_CACHE_FORMAT, quiz_data), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # Read-only deployments simply re-parse next time
     return quiz_data
 
 
@@ -32,10 +58,7 @@ def ensure_results_header(path: str):
     if not os.path.exists(path) or os.path.getsize(path) == 0:
         with open(path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow([
-                "timestamp", "user_id", "subject", "difficulty",
-                "score", "total", "dataset", "attempt_no", "time_spent(mins)"
-            ])
+            writer.writerow(RESULTS_HEADER)
 
 
 def log_result(user_id: str, subject: str, difficulty: str, score: int, total: int,
@@ -46,14 +69,20 @@ def log_result(user_id: str, subject: str, difficulty: str, score: int, total: i
     # Determine current attempt number for this user & subject
     attempt_no = 1
     if os.path.exists(RESULTS_CSV):
-        with open(RESULTS_CSV, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            attempts = [
-                row for row in reader
-                if row["user_id"] == user_id and row["subject"].title() == subject.title()
-            ]
-            if attempts:
-                attempt_no = len(attempts) + 1
+        with open(RESULTS_CSV, newline="", encoding="utf-8", buffering=CSV_READ_BUFFER) as f:
+            # Resolve column positions once from the header, then index rows positionally
+            reader = csv.reader(f)
+            header = next(reader, [])
+            # An empty or foreign header has no attempts to count
+            if "user_id" in header and "subject" in header:
+                user_col, subject_col = header.index("user_id"), header.index("subject")
+                # Blank lines come back as [] and ragged rows as short lists; skip both
+                min_len = max(user_col, subject_col) + 1
+                target_subject = subject.title()
+                attempt_no += sum(
+                    1 for row in reader
+                    if len(row) >= min_len and row[user_col] == user_id and row[subject_col].title() == target_subject
+                )
 
     # Calculate real time spent (in minutes)
     end_time = datetime.now()
@@ -131,13 +160,14 @@ def run():
         total = len(state["questions"])
 
         if current < total:
-            q, options, answer = state["questions"][current]
+            q, options, answer_idx, answer = state["questions"][current]
             st.subheader(f"Question {current+1}/{total}")
             st.write(q)
-            choice = st.radio("Select your answer:", options, key=f"q{current}")
+            choice = st.radio("Select your answer:", range(len(options)),
+                              format_func=options.__getitem__, key=f"q{current}")
 
             if st.button("Submit Answer", key=f"submit{current}"):
-                if choice == answer:
+                if choice == answer_idx:
                     st.success("✅ Correct!")
                     state["score"] += 1
                 else:
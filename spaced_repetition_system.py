@@ -4,7 +4,6 @@ import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
 from datetime import datetime, timedelta
-import io
 import os
 
 # Set page config
@@ -309,12 +308,9 @@ if os.path.exists(csv_file):
                         st.info(rec)
                     
                     # Download schedule
-                    csv_buffer = io.StringIO()
-                    schedule_df.to_csv(csv_buffer, index=False)
-                    
                     st.download_button(
                         label="📥 Download Schedule as CSV",
-                        data=csv_buffer.getvalue(),
+                        data=schedule_df.to_csv(index=False).encode("utf-8"),
                         file_name=f"revision_schedule_{selected_subject}_{selected_difficulty}.csv",
                         mime="text/csv"
                     )
@@ -5,70 +5,80 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 from sklearn.metrics import silhouette_score
 import string
+import os
+
+RESULTS_CSV = "quiz_results.csv"
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def cluster_students(path, mtime):
+    """Aggregate and cluster students once per results file version (mtime keys the cache)."""
+    # 1. loading data
+    data = pd.read_csv(path)
+
+    # remove spaces, lowercase them
+    data.columns = data.columns.str.strip().str.lower()
+
+    # Map difficulty
+    difficulty_map = {"easy": 1, "intermediate": 2, "hard": 3}
+    data["difficulty"] = data["difficulty"].str.strip().str.lower()
+    data["difficulty_num"] = data["difficulty"].map(difficulty_map)
+    data["score_percent"] = (data["score"] / data["total"]) * 100
+
+    # aggregate by student
+    student_perf = (
+        data.groupby("user_id")
+        .agg(
+            Avg_Score=("score_percent", "mean"),
+            Attempts=("score_percent", "count"),
+            Avg_Difficulty=("difficulty_num", "mean"),
+        )
+        .reset_index()
+    )
+
+    # feature scaling
+    features = ["Avg_Score", "Attempts", "Avg_Difficulty"]
+    scaler = StandardScaler()
+    scaled_data = scaler.fit_transform(student_perf[features])
+
+    # optimal cluster finder
+    def optimal_k(scaled_data):
+        sil_scores = []
+        possible_k = range(2, 10)  # or whatever range you use
+
+        for k in possible_k:
+            if len(scaled_data) < k:
+                continue  # skip if not enough samples for this k
+            try:
+                kmeans = KMeans(n_clusters=k, random_state=42)
+                labels = kmeans.fit_predict(scaled_data)
+                score = silhouette_score(scaled_data, labels)
+                sil_scores.append(score)
+            except Exception as e:
+                print(f"Skipping k={k} due to error: {e}")
+                continue
+
+        if not sil_scores:  # nothing collected
+            raise ValueError("No valid silhouette scores could be computed. "
+                     "Check your data or clustering parameters.")
+
+        best_k = np.argmax(sil_scores) + 2  # +2 since range starts from 2
+        return best_k
+
+    best_k = optimal_k(scaled_data)
+    # perform K-means
+    kmeans = KMeans(n_clusters=best_k, random_state=42, n_init=30)
+    student_perf["Cluster"] = kmeans.fit_predict(scaled_data)
+    group_labels = list(string.ascii_uppercase)
+    label_map = {i: group_labels[i] for i in range(best_k)}
+    student_perf["Group"] = student_perf["Cluster"].map(label_map)
+
+    return student_perf, best_k
 
 def run():
     st.title("👥 Student Performance Clustering Dashboard")
 
     with st.spinner("⏳ Loading... please wait while we process and compute everything."):
-        # 1. loading data
-        data = pd.read_csv("quiz_results.csv")
-
-        # remove spaces, lowercase them
-        data.columns = data.columns.str.strip().str.lower()
-
-        # Map difficulty
-        difficulty_map = {"easy": 1, "intermediate": 2, "hard": 3}
-        data["difficulty"] = data["difficulty"].str.strip().str.lower()
-        data["difficulty_num"] = data["difficulty"].map(difficulty_map)
-        data["score_percent"] = (data["score"] / data["total"]) * 100
-
-        # aggregate by student
-        student_perf = (
-            data.groupby("user_id")
-            .agg(
-                Avg_Score=("score_percent", "mean"),
-                Attempts=("score_percent", "count"),
-                Avg_Difficulty=("difficulty_num", "mean"),
-            )
-            .reset_index()
-        )
-
-        # feature scaling
-        features = ["Avg_Score", "Attempts", "Avg_Difficulty"]
-        scaler = StandardScaler()
-        scaled_data = scaler.fit_transform(student_perf[features])
-
-        # optimal cluster finder
-        def optimal_k(scaled_data):
-            sil_scores = []
-            possible_k = range(2, 10)  # or whatever range you use
-
-            for k in possible_k:
-                if len(scaled_data) < k:
-                    continue  # skip if not enough samples for this k
-                try:
-                    kmeans = KMeans(n_clusters=k, random_state=42)
-                    labels = kmeans.fit_predict(scaled_data)
-                    score = silhouette_score(scaled_data, labels)
-                    sil_scores.append(score)
-                except Exception as e:
-                    print(f"Skipping k={k} due to error: {e}")
-                    continue
-
-            if not sil_scores:  # nothing collected
-                raise ValueError("No valid silhouette scores could be computed. "
-                         "Check your data or clustering parameters.")
-
-            best_k = np.argmax(sil_scores) + 2  # +2 since range starts from 2
-            return best_k
-
-        best_k = optimal_k(scaled_data)
-        # perform K-means
-        kmeans = KMeans(n_clusters=best_k, random_state=42, n_init=30)
-        student_perf["Cluster"] = kmeans.fit_predict(scaled_data)
-        group_labels = list(string.ascii_uppercase)
-        label_map = {i: group_labels[i] for i in range(best_k)}
-        student_perf["Group"] = student_perf["Cluster"].map(label_map)
+        student_perf, best_k = cluster_students(RESULTS_CSV, os.path.getmtime(RESULTS_CSV))
 
         # Prepare data without cluster/group columns for display
         student_display = student_perf.drop(columns=["Cluster", "Group"])
@@ -162,14 +172,11 @@ def run():
         if st.button("🔍 Recommend Peer"):
             target = student_perf[student_perf["user_id"] == target_id].iloc[0]
 
-            def objective(row):
-                difficulty_diff = abs(row["Avg_Difficulty"] - target["Avg_Difficulty"])
-                score_diff = abs(row["Avg_Score"] - target["Avg_Score"])
-                # Optimization goal: minimize total difference weighted by lambda
-                return difficulty_diff + lambda_param * score_diff
-
             candidates = student_perf[student_perf["user_id"] != target_id].copy()
-            candidates["match_score"] = candidates.apply(objective, axis=1)
+            difficulty_diff = (candidates["Avg_Difficulty"] - target["Avg_Difficulty"]).abs()
+            score_diff = (candidates["Avg_Score"] - target["Avg_Score"]).abs()
+            # Optimization goal: minimize total difference weighted by lambda
+            candidates["match_score"] = difficulty_diff + lambda_param * score_diff
 
             # Find the closest match (lowest combined distance)
             best_peer = candidates.loc[candidates["match_score"].idxmin()]